@@ -1,11 +1,57 @@
 import re
 import json
+import sys
+from functools import lru_cache
+
+
+_STRIP_S_RE = re.compile(r'(?<!\[)S(?!\])')
+
+
+def _tokenize_edit(edit):
+    """
+    Tokenizes an edit string into a list of (op, payload) tuples.
+    Single-char ops ('K', 'D', 'M', 'S') and star ops ('K*', 'D*') have an
+    empty payload, while 'I', 'A', and 'R' carry the text between brackets
+    (e.g., 'R_[x]' -> ('R', 'x')).
+    """
+    tokens = []
+    i = 0
+    n = len(edit)
+
+    while i < n:
+        c = edit[i]
+
+        if c in 'IAR' and edit.startswith('_[', i + 1):
+            j = edit.find(']', i + 3)
+            if j == -1:  # unclosed bracket, treat as a literal char
+                tokens.append((c, ''))
+                i += 1
+                continue
+            # consume any run of closing brackets (']' can be a payload char)
+            while j + 1 < n and edit[j + 1] == ']':
+                j += 1
+            tokens.append((c, edit[i + 3:j]))
+            i = j + 1
+
+        elif c in 'KD' and i + 1 < n and edit[i + 1] == '*':
+            tokens.append((c + '*', ''))
+            i += 2
+
+        else:
+            tokens.append((c, ''))
+            i += 1
+
+    return tokens
 
 
 class Edit:
+    __slots__ = ('word', 'edit')
+
     def __init__(self, word, edit):
-        self.word = word
-        self.edit = edit
+        # words and (especially) edits repeat massively across a dataset;
+        # interning shares one string object across all instances
+        self.word = sys.intern(word) if isinstance(word, str) else word
+        self.edit = sys.intern(edit) if isinstance(edit, str) else edit
     
     @classmethod
     def create(cls, aligned_src_chars, aligned_tgt_chars):
@@ -22,18 +68,21 @@ class Edit:
         """
 
         aligned_src_word = "".join(aligned_src_chars)
+        aligned_tgt_word = "".join(aligned_tgt_chars)
 
-        if aligned_src_chars == aligned_tgt_chars:
+        # string comparison is a C-level memcmp, unlike the element-wise
+        # comparison of the aligned char lists
+        if aligned_src_word == aligned_tgt_word:
             return cls(aligned_src_word, "K")  # Keep whole word
-        
+
         elif aligned_src_chars == [''] and aligned_tgt_chars != ['']:
-            return cls(aligned_src_word, f"I_[{''.join(aligned_tgt_chars)}]")  # Insert whole word
+            return cls(aligned_src_word, f"I_[{aligned_tgt_word}]")  # Insert whole word
 
         elif aligned_src_chars != [''] and aligned_tgt_chars == ['']:
             return cls(aligned_src_word, "D")  # Delete whole word
 
-        elif is_merge(aligned_src_chars, aligned_tgt_chars):
-            return cls(aligned_src_word, "".join(['K' if c != ' ' else 'M' for c in aligned_src_chars]))  # Merge
+        elif is_merge(aligned_src_word, aligned_tgt_word):
+            return cls(aligned_src_word, mark_spaces(aligned_src_word, 'K'))  # Merge
 
         else:
             edit = cls._generate_detailed_edit(aligned_src_chars, aligned_tgt_chars)
@@ -57,7 +106,7 @@ class Edit:
                 edit.append(f'MI_[{tgt_chars}]')
 
             elif src_chars != '' and tgt_chars == '': # Delete and mark spaces as merges if necessary
-                edit.append(''.join(['D' if c != ' ' else 'M' for c in src_chars]))
+                edit.append(mark_spaces(src_chars, 'D'))
     
             elif src_chars == '' and tgt_chars != '': # Insert
                 edit.append(f'I_[{tgt_chars}]')
@@ -77,20 +126,13 @@ class Edit:
             return f'R_[{tgt_chars}]'
 
         elif len(src_chars) == len(tgt_chars): # One-to-one replacement
-            edits = []
-            for i in range(len(src_chars)):
-                if src_chars[i] == ' ':
-                    edits.append('M')
-                    edits.append(f"I_[{tgt_chars[i]}]")
-                else:
-                    edits.append(f"R_[{tgt_chars[i]}]")
-
-            return ''.join(edits)
+            return ''.join([f"MI_[{t_char}]" if s_char == ' ' else f"R_[{t_char}]"
+                            for s_char, t_char in zip(src_chars, tgt_chars)])
 
         else:  # Replace each src char and insert remaining tgt chars
-            replacements = ''.join([f"R_[{tgt_chars[i]}]" for i in range(len(src_chars))])
+            replacements = ''.join([f"R_[{t_char}]" for t_char in tgt_chars[:len(src_chars)]])
             insertions = ''.join([f"I_[{t_char}]" for t_char in tgt_chars[len(src_chars):]])
-            return replacements + insertions 
+            return replacements + insertions
 
     def apply(self, text):
         pass
@@ -114,10 +156,38 @@ class Edit:
 
 
 class SubwordEdit:
+    __slots__ = ('subword', 'raw_subword', 'edit', '_tokens', '_num_ops',
+                 '_consume_count', '_has_star', '_always_applicable',
+                 '_star_applicable')
+
     def __init__(self, subword, raw_subword, edit):
-        self.subword = subword
-        self.raw_subword = raw_subword
-        self.edit = edit
+        # interned for the same reason as Edit: subwords and edits are
+        # drawn from small vocabularies that repeat across the dataset
+        self.subword = sys.intern(subword) if isinstance(subword, str) else subword
+        self.raw_subword = sys.intern(raw_subword) if isinstance(raw_subword, str) else raw_subword
+        self.edit = sys.intern(edit) if isinstance(edit, str) else edit
+        self._tokens = _tokenize_edit(edit)
+
+        # precomputed applicability stats, shared by every is_applicable call
+        ops = [op for op, _ in self._tokens if op not in ('A', 'M', 'I')]
+        self._num_ops = len(ops)
+        self._consume_count = sum(1 for op in ops if op in ('K', 'D', 'R'))
+        self._has_star = 'K*' in ops or 'D*' in ops
+        self._always_applicable = edit == 'K' or edit.startswith('KA')
+
+        if self._has_star:
+            # with a star, the edit fits any long-enough subword as long as
+            # every op after the last star consumes a character
+            last_star = max(i for i, op in enumerate(ops) if op in ('K*', 'D*'))
+            self._star_applicable = all(op in ('K', 'D', 'R')
+                                        for op in ops[last_star + 1:])
+        else:
+            self._star_applicable = False
+
+    @property
+    def tokens(self):
+        """Tokenized edit as a list of (op, payload) tuples."""
+        return self._tokens
 
     def apply(self, subword):
         # Keep
@@ -133,8 +203,7 @@ class SubwordEdit:
 
         # Handle other char-level edits
         _subword = subword.replace('##', '')
-        char_edits = re.findall(r'I_\[.*?\]+|A_\[.*?\]+|R_\[.*?\]+|K\*|D\*|.', self.edit)
-        edited_subword = self._apply_char_edits(_subword, char_edits)
+        edited_subword = self._apply_char_edits(_subword, self.tokens)
 
         # Handle subwords with prefix "##"
         return '##' + edited_subword if '##' in subword else edited_subword
@@ -143,45 +212,44 @@ class SubwordEdit:
         """
         Helper method to handle append edits ('KA' or 'DA').
         """
-        ops = re.findall(r'A_\[.*?\]+', self.edit)
-        inserts = [re.sub(r'A_\[(.*?)\]', r'\1', op) for op in ops]
+        inserts = [payload for op, payload in self.tokens if op == 'A']
         return subword + ' ' + ' '.join(inserts) if keep else ''.join(inserts)
 
     def _apply_char_edits(self, subword, char_edits):
         """
         Apply character-level edits to the word piece (wp).
         """
-        edited_subword = ''
+        parts = []
         idx = 0
 
-        for i, char_edit in enumerate(char_edits):
-            if char_edit == 'K':  # Keep
-                edited_subword += subword[idx]
+        for i, (op, payload) in enumerate(char_edits):
+            if op == 'K':  # Keep
+                parts.append(subword[idx])
                 idx += 1
-            
-            elif char_edit == 'D':  # Delete
+
+            elif op == 'D':  # Delete
                 idx += 1
 
-            elif char_edit.startswith('I'):  # Insert
-                edited_subword += re.sub(r'I_\[(.*?)\]', r'\1', char_edit)
+            elif op == 'I':  # Insert
+                parts.append(payload)
 
-            elif char_edit.startswith('A'):  # Append
-                edited_subword += (' ' + re.sub(r'A_\[(.*?)\]', r'\1', char_edit) if i
-                           else re.sub(r'A_\[(.*?)\]', r'\1', char_edit) + ' ')
+            elif op == 'A':  # Append
+                parts.append(' ' + payload if i
+                             else payload + ' ')
 
-            elif char_edit == 'K*':  # Keep and handle remaining edits
-                chars_to_keep = self._apply_keep_star(''.join(subword[idx:]), char_edits, i + 1)
+            elif op == 'K*':  # Keep and handle remaining edits
+                chars_to_keep = self._apply_keep_star(subword[idx:], char_edits, i + 1)
                 idx += len(chars_to_keep)  # Adjust the index after applying K*
-                edited_subword += chars_to_keep
+                parts.append(chars_to_keep)
 
-            elif char_edit == 'D*':
-                idx += self._apply_delete_star(''.join(subword[idx:]), char_edits, i + 1)
+            elif op == 'D*':
+                idx += self._apply_delete_star(subword[idx:], char_edits, i + 1)
 
-            elif char_edit.startswith('R'):  # Replace
-                edited_subword += re.sub(r'R_\[(.*?)\]', r'\1', char_edit)
+            elif op == 'R':  # Replace
+                parts.append(payload)
                 idx += 1
 
-        return edited_subword
+        return ''.join(parts)
 
 
     def _apply_keep_star(self, subword, char_edits, edit_idx):
@@ -189,7 +257,7 @@ class SubwordEdit:
         Handle special case of 'K*' if it appears in the beggining of an edit
         """
         remaining_edits = char_edits[edit_idx:]
-        inserts = [x for x in remaining_edits if (x.startswith('I') or x.startswith('A'))]
+        inserts = [op for op, _ in remaining_edits if op in ('I', 'A')]
 
         if len(inserts) == len(remaining_edits):  # if all inserts, add everything
             return ''.join(subword[:])
@@ -200,8 +268,7 @@ class SubwordEdit:
 
     def _apply_delete_star(self, subword, char_edits, edit_idx):
         remaining_edits = char_edits[edit_idx:]
-        inserts_replaces = [x for x in remaining_edits
-                            if (x.startswith('I') or x.startswith('A'))]
+        inserts_replaces = [op for op, _ in remaining_edits if op in ('I', 'A')]
 
         if len(inserts_replaces) == len(remaining_edits):  # if all inserts/replaces, delete everything
             return len(subword)
@@ -211,38 +278,20 @@ class SubwordEdit:
 
 
     def is_applicable(self, subword):
-        _subword = subword.replace('##', '')
-        char_edits = re.findall(r'I_\[.*?\]+|A_\[.*?\]+|R_\[.*?\]+|K\*|D\*|.', self.edit)
-        char_edits_wo_append_merge = [e for e in char_edits if(not e.startswith('A') and
-                                      not e.startswith('M') and not e.startswith('I'))]
-
-        if self.edit == 'K' or self.edit.startswith('KA'):
+        if self._always_applicable:
             return True
-    
+
+        _subword = subword.replace('##', '') if '#' in subword else subword
 
         # if the number of subwords is less than the edits (without A or M), the edit isn't applicable
-        if len(_subword) < len(char_edits_wo_append_merge):
+        if len(_subword) < self._num_ops:
             return False
 
-        idx = 0
-
-        for i, edit in enumerate(char_edits_wo_append_merge):
-            if edit.startswith('R') or edit in ['K', 'D']:
-                idx += 1
-
-            elif edit in ['K*', 'D*']: # we need to advance idx until we reach the edit
-                if i == len(char_edits_wo_append_merge) - 1:
-                    idx += len(_subword[idx:])
-                    break
-
-                idx = len(_subword[: -len(char_edits_wo_append_merge[i + 1:])])
-            
+        if self._has_star:
+            return self._star_applicable
 
-        # if we haven't passed over all subwords, the edit isn't applicable
-        if idx < len(_subword):
-            return False
-
-        return True
+        # without a star, every subword char has to be consumed by the edit
+        return self._consume_count >= len(_subword)
 
     def __repr__(self):
         return json.dumps(self.to_dict(), indent=2, ensure_ascii=False)
@@ -262,6 +311,8 @@ class SubwordEdits:
     """
     A wrapper class to create subword edits given an aligned_src_word and its word-level edit
     """
+    __slots__ = ('subwords', 'edits')
+
     def __init__(self, subwords, edits):
         self.subwords = subwords
         self.edits = edits
@@ -307,57 +358,56 @@ class SubwordEdits:
     def _project_edit(subwords, raw_subwords, edit):
         idx = 0
         subword_edits = []
-        edit_ops = re.findall(r'I_\[.*?\]+|R_\[.*?\]+|D+|K+|.', edit)
-        inserts = [op for op in edit_ops if op.startswith('I_[')]
-        replaces = [op for op in edit_ops if op.startswith('R_[')]
 
         # projecting the edit onto the subwords
         for subword in subwords:
             subword_len = len(subword.replace('##',''))
-            subword_edit = ''
+            subword_edit = []
 
             while subword_len > 0:
-                if idx >= len(edit):
-                    import pdb; pdb.set_trace()
+                assert idx < len(edit), f'ran out of edit ops in {edit!r}'
 
                 if edit[idx] == 'S': # Assign current edit to previous subword in case of S
-                    subword_edits[-1] += subword_edit
-                    subword_edit = ''
+                    subword_edits[-1] += ''.join(subword_edit)
+                    subword_edit = []
                     idx += 1
                     continue
 
                 if edit[idx] == 'I': # inserts
-                    op = inserts.pop(0)
-                    subword_edit += op
-                    idx += len(op)
-    
+                    end = edit.index(']', idx + 3)
+                    while end + 1 < len(edit) and edit[end + 1] == ']':
+                        end += 1
+                    subword_edit.append(edit[idx:end + 1])
+                    idx = end + 1
+
                 elif edit[idx] == 'R':
-                    op = replaces.pop(0)
-                    subword_edit += op
-                    idx += len(op)
+                    end = edit.index(']', idx + 3)
+                    while end + 1 < len(edit) and edit[end + 1] == ']':
+                        end += 1
+                    subword_edit.append(edit[idx:end + 1])
+                    idx = end + 1
                     subword_len -= 1
 
                 elif edit[idx] == 'M': # merges
                     # ensure merges happen first
-                    if len(subword_edit) != 0:
-                        subword_edits[-1] = subword_edits[-1] + subword_edit
-                    subword_edit = edit[idx]
+                    if subword_edit:
+                        subword_edits[-1] = subword_edits[-1] + ''.join(subword_edit)
+                    subword_edit = [edit[idx]]
                     idx += 1
 
                 else: # keeps/deletes
-                    if edit[idx] not in ['K', 'D']:
-                        import pdb; pdb.set_trace()
-                    subword_edit += edit[idx]
+                    assert edit[idx] in ('K', 'D'), f'unexpected op {edit[idx]!r} in {edit!r}'
+                    subword_edit.append(edit[idx])
                     idx += 1
                     subword_len -= 1
 
-            subword_edits.append(subword_edit)
+            subword_edits.append(''.join(subword_edit))
 
         if idx < len(edit):
             subword_edits[-1] = subword_edits[-1] + edit[idx:]
 
 
-        assert ''.join(subword_edits) == re.sub(r"(?<!\[)S(?!\])", '', edit)
+        assert ''.join(subword_edits) == _STRIP_S_RE.sub('', edit)
 
         assert len(subword_edits) == len(subwords) == len(raw_subwords)
 
@@ -393,48 +443,80 @@ def get_edits(src_chars, tgt_chars):
         return ''.join(['M' if c == ' ' else f'R_[{tgt_chars[0]}]' for c in src_chars])
     
     else:
-        edit = ''
+        edit = []
         i, j = 0, 0
         # replace source chars with targets whenever possible
         while i < len(src_chars) and j < len(tgt_chars):
             if src_chars[i] != ' ':
-                edit += f'R_[{tgt_chars[j]}]'
+                edit.append(f'R_[{tgt_chars[j]}]')
                 j += 1
-            elif src_chars[i] == ' ': # merge 
-                edit += 'M'
+            elif src_chars[i] == ' ': # merge
+                edit.append('M')
             i += 1
 
         assert j == len(tgt_chars)
 
         if i < len(src_chars): # delete the rest of the src chars
-            return  edit +  ''.join(['D' * len(src_chars[i:])])
-        return edit
+            edit.append('D' * len(src_chars[i:]))
+        return ''.join(edit)
 
 
-def is_merge(aligned_src_chars, aligned_tgt_chars):
-    return ''.join([c for c in aligned_src_chars if c != ' ']) == ''.join(aligned_tgt_chars)
+def mark_spaces(src, op):
+    """
+    Marks every space in src as a merge ('M') and every other char as op
+    ('K' or 'D'), using per-segment string repetition instead of a
+    per-char Python loop.
+    """
+    return 'M'.join([op * len(seg) for seg in src.split(' ')])
 
 
-def compress_edit(edit):
-    grouped_edits = re.findall(r'I_\[.*?\]+|R_\[.*?\]+|A_\[.*?\]+|D+|K+|.', edit)
-    grouped_edits = compress_insertions(grouped_edits) # reducing multiple insertions into one
-    return ''.join(grouped_edits)
+def is_merge(aligned_src_word, aligned_tgt_word):
+    # compare src (minus spaces) to tgt without building the intermediate
+    # string, bailing out on the first mismatch
+    j = 0
+    for c in aligned_src_word:
+        if c == ' ':
+            continue
+        if j >= len(aligned_tgt_word) or c != aligned_tgt_word[j]:
+            return False
+        j += 1
 
+    return j == len(aligned_tgt_word)
 
-def compress_insertions(edits):
-    """Combines consecutive insertions into one."""
-    _edits = []
+
+@lru_cache(maxsize=1 << 16)
+def compress_edit(edit):
+    """Combines consecutive insertions into one in a single pass."""
+    out = []
     insertions = ''
-    for edit in edits:
-        if edit.startswith('I_'):
-            insertions += re.sub(r'I_\[(.*?)\]', r'\1', edit)
+    i = 0
+    n = len(edit)
+
+    while i < n:
+        c = edit[i]
+        end = (edit.find(']', i + 3)
+               if c in 'IAR' and edit.startswith('_[', i + 1) else -1)
+
+        if end != -1:
+            # consume any run of closing brackets (']' can be a payload char)
+            while end + 1 < n and edit[end + 1] == ']':
+                end += 1
+            if c == 'I':  # buffer insertion payloads to merge adjacent ones
+                insertions += edit[i + 3:end]
+                i = end + 1
+                continue
+            token = edit[i:end + 1]
+            i = end + 1
         else:
-            if insertions:
-                _edits.append(f'I_[{insertions}]')
-                insertions = ''
-            _edits.append(edit)
+            token = c
+            i += 1
+
+        if insertions:
+            out.append(f'I_[{insertions}]')
+            insertions = ''
+        out.append(token)
 
     if insertions:
-        _edits.append(f'I_[{insertions}]')
-    
-    return _edits
\ No newline at end of file
+        out.append(f'I_[{insertions}]')
+
+    return sys.intern(''.join(out))
\ No newline at end of file
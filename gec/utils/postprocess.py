@@ -1,5 +1,7 @@
 from camel_tools.utils.charsets import UNICODE_PUNCT_SYMBOL_CHARSET
-import editdistance
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+from rapidfuzz.distance import Levenshtein
 import json
 import string
 import re
@@ -10,13 +12,36 @@ puncs = string.punctuation + ''.join(list(UNICODE_PUNCT_SYMBOL_CHARSET)) + '&amp
 DIGIT_MAPPER={'٠': '0', '١': '1', '٢': '2', '٣': '3', '٤': '4', '٥': '5',
               '٦': '6', '٧': '7', '٨': '8', '٩': '9'}
 
+_DIGIT_TABLE = str.maketrans(DIGIT_MAPPER)
+
+_PUNCS_ESC = re.escape(puncs)
+
+# matches a punctuation char to split off (group 1) or a digit to map (group 2)
+_PNX_OR_DIGIT_RE = re.compile(r'([' + _PUNCS_ESC + r'])(?!\d)|([٠-٩])')
+_SPACE_RE = re.compile(' +')
+
+# maps every punctuation char to None, i.e. deletes it
+_REMOVE_PNX_TABLE = {ord(c): None for c in puncs}
+
+
+def _pnx_or_digit_sub(match):
+    pnx = match.group(1)
+    return f' {pnx} ' if pnx else DIGIT_MAPPER[match.group(2)]
+
 
 def norm_digits(string):
-    s = ""
-    if bool(re.search(r'\d', string)):
-        for c in string:
-            s += DIGIT_MAPPER.get(c, c)
-    return s if s else string
+    return string.translate(_DIGIT_TABLE)
+
+
+def _gated_distance(src_sent, pred_sent, gamma):
+    # Levenshtein distance is lower-bounded by the length difference,
+    # so those predictions can be skipped without running the full DP
+    if abs(len(src_sent) - len(pred_sent)) >= gamma:
+        return gamma
+
+    # score_cutoff stops the DP as soon as the distance is known
+    # to reach gamma (anything >= gamma is rejected anyway)
+    return Levenshtein.distance(src_sent, pred_sent, score_cutoff=gamma)
 
 
 def postprocess(src_sents, preds_sents, verbose=False, gamma=100):
@@ -34,12 +59,18 @@ def postprocess(src_sents, preds_sents, verbose=False, gamma=100):
     post_process_out = []
     skipped_sents = []
 
+    # rapidfuzz releases the GIL, so the per-sentence distances can be
+    # computed on all cores with a plain thread pool
+    with ThreadPoolExecutor() as executor:
+        dists = list(executor.map(_gated_distance, src_sents, preds_sents,
+                                  repeat(gamma)))
+
     pp_sens = []
     for i in range(len(src_sents)):
         src_sent = src_sents[i]
         pred_sent = preds_sents[i]
+        dist = dists[i]
 
-        dist = editdistance.distance(src_sent, pred_sent)
         if dist >= gamma:
             post_process_out.append(src_sent)
             pp_sens.append(src_sent)
@@ -59,45 +90,29 @@ def postprocess(src_sents, preds_sents, verbose=False, gamma=100):
 
 
 def pnx_tokenize(data):
-    pnx_re = re.compile(r'([' + re.escape(puncs) + '])(?!\d)')
-    space_re = re.compile(' +')
-
     pnx_tokenized = []
     for line in data:
-        line = line.strip()
-        line = pnx_re.sub(r' \1 ', line)
-        line = space_re.sub(' ', line)
-        line = norm_digits(line)
-        line = line.strip()
-        pnx_tokenized.append(line)
+        # split punctuation and map digits in a single pass over the line
+        line = _PNX_OR_DIGIT_RE.sub(_pnx_or_digit_sub, line.strip())
+        pnx_tokenized.append(' '.join(line.split()))
 
     return pnx_tokenized
 
 
 def space_clean(data):
-    space_re = re.compile(' +')
-
     space_cleaned = []
     for line in data:
-        line = line.strip()
-        line = space_re.sub(' ', line)
-        line = line.strip()
-        space_cleaned.append(line)
+        line = _SPACE_RE.sub(' ', line.strip())
+        space_cleaned.append(line.strip())
 
     return space_cleaned
 
 
 def remove_pnx(data):
-    pnx_re = re.compile(r'([' + re.escape(puncs) + '])')
-    space_re = re.compile(' +')
-
     nopnx_data = []
     for line in data:
-        line = line.strip()
-        line = pnx_re.sub(r'', line)
-        line = space_re.sub(' ', line)
-        line = line.strip()
-        nopnx_data.append(line)
+        line = line.translate(_REMOVE_PNX_TABLE)
+        nopnx_data.append(' '.join(line.split()))
 
     return nopnx_data
 